@@ -5,29 +5,113 @@
 import argparse
 import json
 import sys
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
 from dataclasses import dataclass, field, asdict
 from datetime import timedelta
-from typing import List, Optional
-from enum import Enum
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Union
+from enum import IntEnum
+from itertools import groupby
+from operator import attrgetter, itemgetter
 
+try:
+    import orjson
+except ImportError:  # без orjson используется стандартный модуль json
+    orjson = None
 
-class MusicGenre(Enum):
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+class MusicGenre(IntEnum):
     """Музыкальные жанры"""
 
-    POP = "Поп"
-    ROCK = "Рок"
-    JAZZ = "Джаз"
-    HIP_HOP = "Хип-хоп"
-    ELECTRONIC = "Электронная"
-    CLASSICAL = "Классическая"
-    COUNTRY = "Кантри"
-    RNB = "R&B"
-    METAL = "Метал"
-    INDIE = "Инди"
-    OTHER = "Другое"
+    POP = 0
+    ROCK = 1
+    JAZZ = 2
+    HIP_HOP = 3
+    ELECTRONIC = 4
+    CLASSICAL = 5
+    COUNTRY = 6
+    RNB = 7
+    METAL = 8
+    INDIE = 9
+    OTHER = 10
 
+    @property
+    def label(self) -> str:
+        """Название жанра для отображения и JSON"""
+        return _GENRE_LABELS[self]
+
+
+# Названия жанров, индексируемые значением MusicGenre
+_GENRE_LABELS = (
+    "Поп",
+    "Рок",
+    "Джаз",
+    "Хип-хоп",
+    "Электронная",
+    "Классическая",
+    "Кантри",
+    "R&B",
+    "Метал",
+    "Инди",
+    "Другое",
+)
+
+# Кэш поиска жанра по названию и по имени
+_GENRE_BY_LABEL: dict[str, MusicGenre] = {g.label: g for g in MusicGenre}
+_GENRE_BY_NAME: dict[str, MusicGenre] = {g.name: g for g in MusicGenre}
+
+# Критерии сортировки -> кэшированные атрибуты Track
+_SORT_ATTRS: dict[str, str] = {
+    "duration": "_duration_seconds",
+    "title": "_title_lower",
+    "artist": "_artist_lower",
+}
+
+
+def _duration_range_indices(durations: array, lo: int, hi: int) -> List[int]:
+    """Индексы элементов колонки длительностей, попадающих в [lo, hi]"""
+    return [i for i, d in enumerate(durations) if lo <= d <= hi]
+
+
+# Таблица перекодировки байтов: цифра -> ее значение, ':' -> _COLON,
+# все остальное -> _BAD
+_COLON = 10
+_BAD = 11
+_DIGIT = bytes(
+    b - 48 if 48 <= b <= 57 else _COLON if b == 58 else _BAD for b in range(256)
+)
+
+
+def _parse_duration_seconds(value: str, allow_seconds: bool = False) -> int:
+    """Парсинг строки MM:SS или HH:MM:SS сразу в секунды
+
+    При allow_seconds=True допускается также число секунд без двоеточий.
+    """
+    total = 0
+    acc = 0
+    digits = 0
+    parts = 1
+    for d in value.strip().encode("ascii").translate(_DIGIT):
+        if d < _COLON:
+            acc = acc * 10 + d
+            digits += 1
+        elif d == _COLON and digits:
+            total = total * 60 + acc
+            acc = 0
+            digits = 0
+            parts += 1
+        else:
+            break
+    else:
+        if digits and (parts in (2, 3) or (allow_seconds and parts == 1)):
+            return total * 60 + acc
+    raise ValueError(f"Неверный формат длительности: {value}")
 
-@dataclass
+
+@dataclass(slots=True)
 class Track:
     """Датакласс для представления музыкального трека"""
 
@@ -37,29 +121,65 @@ class Track:
     genre: MusicGenre = MusicGenre.OTHER
     year: Optional[int] = None
 
+    # Кэшируемые значения, вычисляемые один раз после валидации
+    _duration_seconds: int = field(init=False, repr=False, compare=False)
+    # casefold, чтобы сравнение исполнителей было корректным для Unicode
+    _artist_lower: str = field(init=False, repr=False, compare=False)
+    _title_lower: str = field(init=False, repr=False, compare=False)
+
     def __post_init__(self):
         """Валидация данных после инициализации"""
-        if not self.title.strip():
+        self._validate(
+            self.title, self.artist, self.duration.total_seconds(), self.year
+        )
+
+        self._duration_seconds = int(self.duration.total_seconds())
+        self._artist_lower = self.artist.casefold()
+        self._title_lower = self.title.lower()
+
+    @staticmethod
+    def _validate(title: str, artist: str, seconds: float, year: Optional[int]):
+        """Проверка значений полей трека"""
+        if not title.strip():
             raise ValueError("Название трека не может быть пустым")
-        if not self.artist.strip():
+        if not artist.strip():
             raise ValueError("Имя исполнителя не может быть пустым")
-        if self.duration.total_seconds() <= 0:
+        if seconds <= 0:
             raise ValueError("Длительность должна быть положительной")
-        if self.year is not None and (self.year < 1900 or self.year > 2100):
+        if year is not None and (year < 1900 or year > 2100):
             raise ValueError("Некорректный год")
 
+    @classmethod
+    def _from_trusted(
+        cls,
+        title: str,
+        artist: str,
+        duration_seconds: int,
+        genre: MusicGenre,
+        year: Optional[int],
+    ) -> "Track":
+        """Создание трека из уже проверенных значений в обход __init__"""
+        track = object.__new__(cls)
+        track.title = title
+        track.artist = artist
+        track.duration = timedelta(seconds=duration_seconds)
+        track.genre = genre
+        track.year = year
+        track._duration_seconds = duration_seconds
+        track._artist_lower = artist.casefold()
+        track._title_lower = title.lower()
+        return track
+
     @property
     def duration_str(self) -> str:
         """Возвращает длительность в формате MM:SS"""
-        total_seconds = int(self.duration.total_seconds())
-        minutes = total_seconds // 60
-        seconds = total_seconds % 60
+        minutes, seconds = divmod(self._duration_seconds, 60)
         return f"{minutes:02d}:{seconds:02d}"
 
     @property
     def duration_seconds(self) -> int:
         """Возвращает длительность в секундах"""
-        return int(self.duration.total_seconds())
+        return self._duration_seconds
 
     def to_dict(self) -> dict:
         """Сериализация в словарь для JSON"""
@@ -67,58 +187,135 @@ class Track:
             "title": self.title,
             "artist": self.artist,
             "duration": self.duration_str,
-            "genre": self.genre.value,
+            "genre": self.genre.label,
             "year": self.year,
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> "Track":
         """Десериализация из словаря"""
-        # Преобразуем строку длительности в timedelta
-        duration_parts = data["duration"].split(":")
-        if len(duration_parts) == 2:
-            minutes, seconds = map(int, duration_parts)
-            duration = timedelta(minutes=minutes, seconds=seconds)
-        elif len(duration_parts) == 3:
-            hours, minutes, seconds = map(int, duration_parts)
-            duration = timedelta(hours=hours, minutes=minutes, seconds=seconds)
-        else:
-            raise ValueError(f"Неверный формат длительности: {data['duration']}")
-
-        # Находим жанр по значению
-        genre_value = data.get("genre", "Другое")
-        genre = MusicGenre.OTHER
-        for g in MusicGenre:
-            if g.value == genre_value:
-                genre = g
-                break
-
-        return cls(
-            title=data["title"],
-            artist=data["artist"],
-            duration=duration,
-            genre=genre,
-            year=data.get("year"),
-        )
+        # Преобразуем строку длительности в секунды без промежуточного split
+        seconds = _parse_duration_seconds(data["duration"])
+
+        # Находим жанр по названию
+        genre = _GENRE_BY_LABEL.get(data.get("genre", "Другое"), MusicGenre.OTHER)
+
+        # Файл мог быть изменен вручную, поэтому значения проверяются,
+        # но сам трек собирается без повторного пересчета в __post_init__
+        title = data["title"]
+        artist = data["artist"]
+        year = data.get("year")
+        cls._validate(title, artist, seconds, year)
+
+        return cls._from_trusted(title, artist, seconds, genre, year)
 
     def __str__(self) -> str:
         """Строковое представление трека"""
         year_str = f" ({self.year})" if self.year else ""
         return (
             f"🎵 '{self.title}' - {self.artist}{year_str} "
-            f"[{self.genre.value}] ⏱ {self.duration_str}"
+            f"[{self.genre.label}] ⏱ {self.duration_str}"
         )
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
+class TrackView(Sequence[Track]):
+    """Выборка треков плейлиста, хранящая только индексы
+
+    Индексы относятся к текущему порядку треков в плейлисте, поэтому
+    выборку нужно получать заново после сортировки или удаления треков.
+    """
+
+    playlist: "Playlist"
+    indices: List[int]
+
+    def __repr__(self) -> str:
+        """Краткое представление без содержимого всего плейлиста"""
+        return f"TrackView({len(self.indices)} треков из '{self.playlist.name}')"
+
+    def __len__(self) -> int:
+        """Количество треков в выборке"""
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator[Track]:
+        """Обход треков выборки"""
+        tracks = self.playlist.tracks
+        return (tracks[i] for i in self.indices)
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[Track, "TrackView"]:
+        """Трек по позиции в выборке; срез возвращает новую выборку"""
+        if isinstance(position, slice):
+            return TrackView(self.playlist, self.indices[position])
+        return self.playlist.tracks[self.indices[position]]
+
+    def sort(
+        self, *, key: Optional[Callable[[Track], Any]] = None, reverse: bool = False
+    ) -> None:
+        """Отсортировать выборку по ключу от трека, как list.sort"""
+        tracks = self.playlist.tracks
+        if key is None:
+            self.indices.sort(key=tracks.__getitem__, reverse=reverse)
+        else:
+            self.indices.sort(key=lambda i: key(tracks[i]), reverse=reverse)
+
+    def sort_by_duration(self, descending: bool = False) -> None:
+        """Отсортировать выборку по длительности"""
+        self.indices.sort(key=self.playlist._durations.__getitem__, reverse=descending)
+
+    def sort_by_title(self, descending: bool = False) -> None:
+        """Отсортировать выборку по названию"""
+        tracks = self.playlist.tracks
+        self.indices.sort(key=lambda i: tracks[i]._title_lower, reverse=descending)
+
+    def sort_by_artist(self, descending: bool = False) -> None:
+        """Отсортировать выборку по исполнителю"""
+        tracks = self.playlist.tracks
+        self.indices.sort(key=lambda i: tracks[i]._artist_lower, reverse=descending)
+
+
+@dataclass(slots=True)
 class Playlist:
     """Контейнер для хранения и управления коллекцией треков"""
 
     name: str
     tracks: List[Track] = field(default_factory=list)
 
+    # Колонка длительностей, параллельная self.tracks
+    _durations: array = field(init=False, repr=False, compare=False)
+    # Индексы: ключ -> позиции треков в self.tracks
+    _artist_index: dict = field(init=False, repr=False, compare=False)
+    _genre_index: dict = field(init=False, repr=False, compare=False)
+    # Пары (год, позиция), упорядоченные для поиска делением пополам
+    _year_sorted: list = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Построение колонки и индексов для переданных треков"""
+        self._reindex()
+
+    def _reindex(self) -> None:
+        """Пересобрать колонку и индексы по текущему списку треков"""
+        self._durations = array("q")
+        self._artist_index = defaultdict(list)
+        self._genre_index = defaultdict(list)
+        for i, track in enumerate(self.tracks):
+            self._index_track(i, track)
+        self._year_sorted = sorted(
+            (track.year, i) for i, track in enumerate(self.tracks) if track.year
+        )
+
+    def _index_track(self, i: int, track: Track) -> None:
+        """Занести трек с позицией i в колонку и индексы"""
+        self._durations.append(track._duration_seconds)
+        self._artist_index[track._artist_lower].append(i)
+        self._genre_index[track.genre].append(i)
+
     def add_track(self, track: Track) -> None:
         """Добавить трек в плейлист"""
+        # Сначала индексы: при ошибке список треков остается нетронутым
+        i = len(self.tracks)
+        self._index_track(i, track)
+        if track.year:
+            insort(self._year_sorted, (track.year, i))
         self.tracks.append(track)
 
     def add_tracks(self, *tracks: Track) -> None:
@@ -130,71 +327,80 @@ class Playlist:
         """Удалить трек по индексу"""
         if 0 <= index < len(self.tracks):
             del self.tracks[index]
+            # Позиции последующих треков сдвинулись
+            self._reindex()
             return True
         return False
 
-    def get_tracks_by_artist(self, artist: str) -> List[Track]:
+    def get_tracks_by_artist(self, artist: str) -> TrackView:
         """Получить треки указанного исполнителя"""
-        artist_lower = artist.strip().lower()
-        return [track for track in self.tracks if track.artist.lower() == artist_lower]
+        artist_lower = artist.strip().casefold()
+        return TrackView(self, list(self._artist_index.get(artist_lower, ())))
 
-    def get_tracks_by_genre(self, genre: MusicGenre) -> List[Track]:
+    def get_tracks_by_genre(self, genre: MusicGenre) -> TrackView:
         """Получить треки указанного жанра"""
-        return [track for track in self.tracks if track.genre == genre]
+        return TrackView(self, list(self._genre_index.get(genre, ())))
 
-    def get_tracks_by_year(self, year: int) -> List[Track]:
+    def get_tracks_by_year(self, year: int) -> TrackView:
         """Получить треки указанного года"""
-        return [track for track in self.tracks if track.year == year]
+        lo = bisect_left(self._year_sorted, (year, 0))
+        hi = bisect_right(self._year_sorted, (year, sys.maxsize))
+        return TrackView(self, [i for _, i in self._year_sorted[lo:hi]])
 
-    def get_tracks_in_duration_range(self, min_sec: int, max_sec: int) -> List[Track]:
+    def get_tracks_in_duration_range(self, min_sec: int, max_sec: int) -> TrackView:
         """Получить треки, длительность которых в указанном диапазоне (в секундах)"""
-        return [
-            track
-            for track in self.tracks
-            if min_sec <= track.duration_seconds <= max_sec
-        ]
+        return TrackView(
+            self, _duration_range_indices(self._durations, min_sec, max_sec)
+        )
 
     def sort_by_duration(self, descending: bool = False) -> None:
         """Отсортировать треки по длительности"""
-        self.tracks.sort(key=lambda t: t.duration_seconds, reverse=descending)
+        self.tracks.sort(key=attrgetter("_duration_seconds"), reverse=descending)
+        self._reindex()
 
     def sort_by_title(self, descending: bool = False) -> None:
         """Отсортировать треки по названию"""
-        self.tracks.sort(key=lambda t: t.title.lower(), reverse=descending)
+        self.tracks.sort(key=attrgetter("_title_lower"), reverse=descending)
+        self._reindex()
 
     def sort_by_artist(self, descending: bool = False) -> None:
         """Отсортировать треки по исполнителю"""
-        self.tracks.sort(key=lambda t: t.artist.lower(), reverse=descending)
+        self.tracks.sort(key=attrgetter("_artist_lower"), reverse=descending)
+        self._reindex()
+
+    def sort_multi(self, keys: Sequence[str], descending: bool = False) -> None:
+        """Отсортировать треки по нескольким критериям ("artist", "title", ...)"""
+        key = attrgetter(*(_SORT_ATTRS[k] for k in keys))
+        self.tracks.sort(key=key, reverse=descending)
+        self._reindex()
 
     def get_total_duration(self) -> timedelta:
         """Получить общую длительность плейлиста"""
-        total_seconds = sum(track.duration_seconds for track in self.tracks)
-        return timedelta(seconds=total_seconds)
+        return timedelta(seconds=sum(self._durations))
 
     def get_statistics(self) -> dict:
         """Получить статистику по плейлисту"""
-        stats = {
+        # Все показатели берутся из индексов без прохода по трекам;
+        # годы уже упорядочены, так как _year_sorted отсортирован
+        years_sorted = [
+            (year, len(list(group)))
+            for year, group in groupby(self._year_sorted, key=itemgetter(0))
+        ]
+        return {
             "total_tracks": len(self.tracks),
             "total_duration": str(self.get_total_duration()),
-            "artists": len(set(track.artist.lower() for track in self.tracks)),
-            "genres": {},
-            "years": {},
+            "artists": len(self._artist_index),
+            # Жанры выводятся в порядке объявления MusicGenre
+            "genres": {
+                genre.label: len(self._genre_index[genre])
+                for genre in MusicGenre
+                if genre in self._genre_index
+            },
+            "years": dict(years_sorted),
+            "years_sorted": years_sorted,
         }
 
-        # Статистика по жанрам
-        for genre in MusicGenre:
-            count = len(self.get_tracks_by_genre(genre))
-            if count > 0:
-                stats["genres"][genre.value] = count
-
-        # Статистика по годам
-        for track in self.tracks:
-            if track.year:
-                stats["years"][track.year] = stats["years"].get(track.year, 0) + 1
-
-        return stats
-
-    def display_tracks(self, tracks: Optional[List[Track]] = None) -> None:
+    def display_tracks(self, tracks: Optional[Sequence[Track]] = None) -> None:
         """Вывести список треков"""
         if tracks is None:
             tracks = self.tracks
@@ -203,11 +409,11 @@ class Playlist:
             print("😔 Нет треков для отображения")
             return
 
-        print(f"\n📋 Плейлист '{self.name}' ({len(tracks)} треков):")
-        print("=" * 80)
-        for i, track in enumerate(tracks, 1):
-            print(f"{i:3}. {track}")
-        print("=" * 80)
+        # Весь список выводится одной операцией записи
+        lines = [f"\n📋 Плейлист '{self.name}' ({len(tracks)} треков):", "=" * 80]
+        lines.extend(f"{i:3}. {track}" for i, track in enumerate(tracks, 1))
+        lines.append("=" * 80)
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def save_to_json(self, filename: str) -> bool:
         """Сохранить плейлист в JSON файл"""
@@ -217,8 +423,14 @@ class Playlist:
                 "tracks": [track.to_dict() for track in self.tracks],
             }
 
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                with open(filename, "wb") as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                # Документ кодируется целиком и записывается за один вызов
+                buf = json.dumps(data, ensure_ascii=False, indent=2)
+                with open(filename, "w", encoding="utf-8") as f:
+                    f.write(buf)
 
             print(f"✅ Плейлист сохранен в файл: {filename}")
             return True
@@ -229,14 +441,23 @@ class Playlist:
     def load_from_json(self, filename: str) -> bool:
         """Загрузить плейлист из JSON файла"""
         try:
-            with open(filename, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(filename, "rb") as f:
+                data = _json_loads(f.read())
 
             self.name = data.get("playlist_name", self.name)
             self.tracks.clear()
+            self._reindex()
+
+            # Повторяющиеся строки заменяются одним общим объектом
+            artist_pool: dict[str, str] = {}
+            title_pool: dict[str, str] = {}
 
             for track_data in data.get("tracks", []):
                 try:
+                    artist = track_data["artist"]
+                    title = track_data["title"]
+                    track_data["artist"] = artist_pool.setdefault(artist, artist)
+                    track_data["title"] = title_pool.setdefault(title, title)
                     track = Track.from_dict(track_data)
                     self.add_track(track)
                 except Exception as e:
@@ -263,9 +484,30 @@ class Playlist:
 class MusicManagerCLI:
     """Класс для управления CLI интерфейсом"""
 
+    # Критерий сортировки -> метод сортировки плейлиста и выборки
+    _PLAYLIST_SORTERS = {
+        "duration": Playlist.sort_by_duration,
+        "title": Playlist.sort_by_title,
+        "artist": Playlist.sort_by_artist,
+    }
+    _VIEW_SORTERS = {
+        "duration": TrackView.sort_by_duration,
+        "title": TrackView.sort_by_title,
+        "artist": TrackView.sort_by_artist,
+    }
+
     def __init__(self):
         self.playlist = Playlist("Мой плейлист")
         self.setup_parser()
+        self._handlers = {
+            "add": self.handle_add,
+            "show": self.handle_show,
+            "filter": self.handle_filter,
+            "stats": self.handle_stats,
+            "save": self.handle_save,
+            "load": self.handle_load,
+            "demo": self.handle_demo,
+        }
 
     def setup_parser(self):
         """Настройка парсера аргументов командной строки"""
@@ -285,7 +527,27 @@ class MusicManagerCLI:
 
         subparsers = self.parser.add_subparsers(dest="command", help="Команды")
 
-        # Команда add: добавить трек
+        builders = {
+            "add": self._build_add_parser,
+            "show": self._build_show_parser,
+            "filter": self._build_filter_parser,
+            "stats": self._build_stats_parser,
+            "save": self._build_save_parser,
+            "load": self._build_load_parser,
+            "demo": self._build_demo_parser,
+        }
+
+        # Если команда известна, строим только ее подпарсер,
+        # иначе (справка, ошибка) - все подпарсеры
+        command = sys.argv[1] if len(sys.argv) > 1 else None
+        if command in builders:
+            builders[command](subparsers)
+        else:
+            for build in builders.values():
+                build(subparsers)
+
+    def _build_add_parser(self, subparsers):
+        """Команда add: добавить трек"""
         parser_add = subparsers.add_parser("add", help="Добавить новый трек")
         parser_add.add_argument("--title", required=True, help="Название трека")
         parser_add.add_argument("--artist", required=True, help="Исполнитель")
@@ -300,7 +562,8 @@ class MusicManagerCLI:
         )
         parser_add.add_argument("--year", type=int, help="Год выпуска")
 
-        # Команда show: показать треки
+    def _build_show_parser(self, subparsers):
+        """Команда show: показать треки"""
         parser_show = subparsers.add_parser("show", help="Показать все треки")
         parser_show.add_argument(
             "--sort",
@@ -311,7 +574,8 @@ class MusicManagerCLI:
             "--reverse", action="store_true", help="Сортировка по убыванию"
         )
 
-        # Команда filter: фильтрация треков
+    def _build_filter_parser(self, subparsers):
+        """Команда filter: фильтрация треков"""
         parser_filter = subparsers.add_parser("filter", help="Фильтрация треков")
         filter_group = parser_filter.add_mutually_exclusive_group(required=True)
         filter_group.add_argument("--artist", help="Фильтр по исполнителю")
@@ -334,10 +598,12 @@ class MusicManagerCLI:
             "--reverse", action="store_true", help="Сортировка по убыванию"
         )
 
-        # Команда stats: статистика
-        parser_stats = subparsers.add_parser("stats", help="Статистика плейлиста")
+    def _build_stats_parser(self, subparsers):
+        """Команда stats: статистика"""
+        subparsers.add_parser("stats", help="Статистика плейлиста")
 
-        # Команда save: сохранить в JSON
+    def _build_save_parser(self, subparsers):
+        """Команда save: сохранить в JSON"""
         parser_save = subparsers.add_parser("save", help="Сохранить в JSON файл")
         parser_save.add_argument(
             "--file",
@@ -345,27 +611,21 @@ class MusicManagerCLI:
             help="Имя файла (по умолчанию: playlist.json)",
         )
 
-        # Команда load: загрузить из JSON
+    def _build_load_parser(self, subparsers):
+        """Команда load: загрузить из JSON"""
         parser_load = subparsers.add_parser("load", help="Загрузить из JSON файла")
         parser_load.add_argument("--file", required=True, help="Имя файла")
 
-        # Команда demo: демонстрационные данные
+    def _build_demo_parser(self, subparsers):
+        """Команда demo: демонстрационные данные"""
         subparsers.add_parser("demo", help="Добавить демонстрационные данные")
 
     def parse_duration(self, duration_str: str) -> timedelta:
         """Парсинг строки длительности в timedelta"""
         try:
-            parts = duration_str.split(":")
-            if len(parts) == 2:
-                minutes, seconds = map(int, parts)
-                return timedelta(minutes=minutes, seconds=seconds)
-            elif len(parts) == 3:
-                hours, minutes, seconds = map(int, parts)
-                return timedelta(hours=hours, minutes=minutes, seconds=seconds)
-            else:
-                # Попробуем интерпретировать как секунды
-                seconds = int(duration_str)
-                return timedelta(seconds=seconds)
+            # Без двоеточий строка интерпретируется как число секунд
+            seconds = _parse_duration_seconds(duration_str, allow_seconds=True)
+            return timedelta(seconds=seconds)
         except ValueError:
             raise argparse.ArgumentTypeError(
                 f"Неверный формат длительности: '{duration_str}'. "
@@ -376,7 +636,7 @@ class MusicManagerCLI:
         """Обработка команды add"""
         try:
             duration = self.parse_duration(args.duration)
-            genre = MusicGenre[args.genre]
+            genre = _GENRE_BY_NAME[args.genre]
 
             track = Track(
                 title=args.title,
@@ -402,12 +662,7 @@ class MusicManagerCLI:
 
         # Применяем сортировку если указана
         if args.sort:
-            if args.sort == "duration":
-                self.playlist.sort_by_duration(args.reverse)
-            elif args.sort == "title":
-                self.playlist.sort_by_title(args.reverse)
-            elif args.sort == "artist":
-                self.playlist.sort_by_artist(args.reverse)
+            self._PLAYLIST_SORTERS[args.sort](self.playlist, args.reverse)
 
         self.playlist.display_tracks()
 
@@ -420,13 +675,14 @@ class MusicManagerCLI:
         filtered_tracks = []
 
         if args.artist:
+            # Запрос нормализуется внутри get_tracks_by_artist
             filtered_tracks = self.playlist.get_tracks_by_artist(args.artist)
             print(f"🔍 Треки исполнителя '{args.artist}':")
 
         elif args.genre:
-            genre = MusicGenre[args.genre]
+            genre = _GENRE_BY_NAME[args.genre]
             filtered_tracks = self.playlist.get_tracks_by_genre(genre)
-            print(f"🔍 Треки жанра '{genre.value}':")
+            print(f"🔍 Треки жанра '{genre.label}':")
 
         elif args.year:
             filtered_tracks = self.playlist.get_tracks_by_year(args.year)
@@ -451,18 +707,7 @@ class MusicManagerCLI:
 
         # Применяем сортировку если указана
         if args.sort:
-            if args.sort == "duration":
-                filtered_tracks.sort(
-                    key=lambda t: t.duration_seconds, reverse=args.reverse
-                )
-            elif args.sort == "title":
-                filtered_tracks.sort(
-                    key=lambda t: t.title.lower(), reverse=args.reverse
-                )
-            elif args.sort == "artist":
-                filtered_tracks.sort(
-                    key=lambda t: t.artist.lower(), reverse=args.reverse
-                )
+            self._VIEW_SORTERS[args.sort](filtered_tracks, args.reverse)
 
         self.playlist.display_tracks(filtered_tracks)
 
@@ -485,9 +730,9 @@ class MusicManagerCLI:
             for genre, count in stats["genres"].items():
                 print(f"  {genre}: {count}")
 
-        if stats["years"]:
+        if stats["years_sorted"]:
             print("\n📅 Распределение по годам:")
-            for year, count in sorted(stats["years"].items()):
+            for year, count in stats["years_sorted"]:
                 print(f"  {year}: {count}")
 
         print("=" * 50)
@@ -590,22 +835,11 @@ class MusicManagerCLI:
 
         args = self.parser.parse_args()
 
-        if args.command == "add":
-            self.handle_add(args)
-        elif args.command == "show":
-            self.handle_show(args)
-        elif args.command == "filter":
-            self.handle_filter(args)
-        elif args.command == "stats":
-            self.handle_stats(args)
-        elif args.command == "save":
-            self.handle_save(args)
-        elif args.command == "load":
-            self.handle_load(args)
-        elif args.command == "demo":
-            self.handle_demo(args)
-        else:
+        handler = self._handlers.get(args.command)
+        if handler is None:
             self.parser.print_help()
+        else:
+            handler(args)
 
 
 def main():
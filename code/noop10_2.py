@@ -3,13 +3,32 @@
 
 
 import click
-import json
+import importlib
 import sys
+from array import array
+from collections import defaultdict
 from dataclasses import dataclass, field, asdict
 from datetime import timedelta
-from typing import List, Optional
+from functools import cache
+from typing import Iterable, List, Optional
 from enum import Enum
 import os
+from operator import attrgetter
+
+# Файлы больше этого размера загружаются потоково через ijson
+_STREAM_LOAD_THRESHOLD = 50 * 1024 * 1024
+
+
+@cache
+def _import_optional(name: str):
+    """Импортировать необязательный модуль или вернуть None, если его нет
+
+    Результат кэшируется: неудачный импорт не повторяет поиск по sys.path.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
 
 
 class MusicGenre(Enum):
@@ -28,7 +47,35 @@ class MusicGenre(Enum):
     OTHER = "Другое"
 
 
-@dataclass
+# Кэш поиска жанра по имени и по значению (точному и в нижнем регистре)
+_GENRE_BY_NAME_UPPER: dict[str, MusicGenre] = {g.name: g for g in MusicGenre}
+_GENRE_BY_VALUE: dict[str, MusicGenre] = {g.value: g for g in MusicGenre}
+_GENRE_BY_VALUE_LOWER: dict[str, MusicGenre] = {g.value.lower(): g for g in MusicGenre}
+
+# Кэшированные ключи сортировки для команды filter
+_FILTER_SORT_KEYS: dict[str, str] = {
+    "duration": "_duration_seconds",
+    "title": "_title_lc",
+    "artist": "_artist_lc",
+}
+
+
+def _duration_range_indices(durations: array, lo: int, hi: int) -> List[int]:
+    """Индексы элементов колонки длительностей, попадающих в [lo, hi]"""
+    return [i for i, seconds in enumerate(durations) if lo <= seconds <= hi]
+
+
+def _parse_duration_seconds(value: str) -> int:
+    """Парсинг строки MM:SS или HH:MM:SS в секунды"""
+    parts = value.split(":")
+    if len(parts) == 2:
+        return int(parts[0]) * 60 + int(parts[1])
+    if len(parts) == 3:
+        return (int(parts[0]) * 60 + int(parts[1])) * 60 + int(parts[2])
+    raise ValueError(f"Неверный формат длительности: {value}")
+
+
+@dataclass(slots=True)
 class Track:
     """Датакласс для представления музыкального трека"""
 
@@ -38,6 +85,16 @@ class Track:
     genre: MusicGenre = MusicGenre.OTHER
     year: Optional[int] = None
 
+    # Кэшируемые значения, заполняемые в __post_init__. Трек не изменяется
+    # после создания: эти кэши, _str_cache и индексы Playlist не обновляются
+    _duration_seconds: int = field(init=False, repr=False, compare=False)
+    _artist_lc: str = field(init=False, repr=False, compare=False)
+    _title_lc: str = field(init=False, repr=False, compare=False)
+    # Отрисованная строка трека, заполняется при первом вызове __str__
+    _str_cache: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self):
         """Валидация данных после инициализации"""
         if not self.title.strip():
@@ -49,18 +106,21 @@ class Track:
         if self.year is not None and (self.year < 1900 or self.year > 2100):
             raise ValueError("Некорректный год")
 
+        # Производные значения для сортировки и фильтрации вычисляются один раз
+        self._duration_seconds = int(self.duration.total_seconds())
+        self._artist_lc = self.artist.lower()
+        self._title_lc = self.title.lower()
+
     @property
     def duration_str(self) -> str:
         """Возвращает длительность в формате MM:SS"""
-        total_seconds = int(self.duration.total_seconds())
-        minutes = total_seconds // 60
-        seconds = total_seconds % 60
+        minutes, seconds = divmod(self._duration_seconds, 60)
         return f"{minutes:02d}:{seconds:02d}"
 
     @property
     def duration_seconds(self) -> int:
         """Возвращает длительность в секундах"""
-        return int(self.duration.total_seconds())
+        return self._duration_seconds
 
     def to_dict(self) -> dict:
         """Сериализация в словарь для JSON"""
@@ -75,22 +135,9 @@ class Track:
     @classmethod
     def from_dict(cls, data: dict) -> "Track":
         """Десериализация из словаря"""
-        duration_parts = data["duration"].split(":")
-        if len(duration_parts) == 2:
-            minutes, seconds = map(int, duration_parts)
-            duration = timedelta(minutes=minutes, seconds=seconds)
-        elif len(duration_parts) == 3:
-            hours, minutes, seconds = map(int, duration_parts)
-            duration = timedelta(hours=hours, minutes=minutes, seconds=seconds)
-        else:
-            raise ValueError(f"Неверный формат длительности: {data['duration']}")
+        duration = timedelta(seconds=_parse_duration_seconds(data["duration"]))
 
-        genre_value = data.get("genre", "Другое")
-        genre = MusicGenre.OTHER
-        for g in MusicGenre:
-            if g.value == genre_value:
-                genre = g
-                break
+        genre = _GENRE_BY_VALUE.get(data.get("genre", "Другое"), MusicGenre.OTHER)
 
         return cls(
             title=data["title"],
@@ -102,22 +149,64 @@ class Track:
 
     def __str__(self) -> str:
         """Строковое представление трека"""
-        year_str = f" ({self.year})" if self.year else ""
-        return (
-            f"🎵 '{self.title}' - {self.artist}{year_str} "
-            f"[{self.genre.value}] ⏱ {self.duration_str}"
-        )
+        if self._str_cache is None:
+            year_str = f" ({self.year})" if self.year else ""
+            self._str_cache = (
+                f"🎵 '{self.title}' - {self.artist}{year_str} "
+                f"[{self.genre.value}] ⏱ {self.duration_str}"
+            )
+        return self._str_cache
 
 
-@dataclass
+@dataclass(slots=True)
 class Playlist:
     """Контейнер для хранения и управления коллекцией треков"""
 
     name: str
     tracks: List[Track] = field(default_factory=list)
 
+    # Колонка длительностей в секундах, параллельная self.tracks
+    _durations_s: array = field(init=False, repr=False, compare=False)
+    # Вторичные индексы: ключ -> треки в порядке плейлиста
+    _by_genre: dict = field(init=False, repr=False, compare=False)
+    _by_artist_lc: dict = field(init=False, repr=False, compare=False)
+    _by_year: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Построение индексов для переданных треков"""
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self) -> None:
+        """Пересобрать индексы по текущему списку треков"""
+        self._durations_s = array("q")
+        self._by_genre = defaultdict(list)
+        self._by_artist_lc = defaultdict(list)
+        self._by_year = defaultdict(list)
+        for track in self.tracks:
+            self._index_track(track)
+
+    def _index_track(self, track: Track) -> None:
+        """Добавить трек в индексы"""
+        self._durations_s.append(track._duration_seconds)
+        self._by_genre[track.genre].append(track)
+        self._by_artist_lc[track._artist_lc].append(track)
+        self._by_year[track.year].append(track)
+
+    @staticmethod
+    def _unindex(index: dict, key, track: Track) -> None:
+        """Удалить трек (по идентичности) из корзины индекса"""
+        bucket = index[key]
+        for i, item in enumerate(bucket):
+            if item is track:
+                del bucket[i]
+                break
+        if not bucket:
+            del index[key]
+
     def add_track(self, track: Track) -> None:
         """Добавить трек в плейлист"""
+        # Сначала индексы: при ошибке список треков остается нетронутым
+        self._index_track(track)
         self.tracks.append(track)
 
     def add_tracks(self, *tracks: Track) -> None:
@@ -128,71 +217,83 @@ class Playlist:
     def remove_track(self, index: int) -> bool:
         """Удалить трек по индексу"""
         if 0 <= index < len(self.tracks):
-            del self.tracks[index]
+            track = self.tracks.pop(index)
+            del self._durations_s[index]
+            self._unindex(self._by_genre, track.genre, track)
+            self._unindex(self._by_artist_lc, track._artist_lc, track)
+            self._unindex(self._by_year, track.year, track)
             return True
         return False
 
+    def clear(self) -> None:
+        """Удалить все треки"""
+        self.tracks.clear()
+        self._rebuild_indexes()
+
     def get_tracks_by_artist(self, artist: str) -> List[Track]:
         """Получить треки указанного исполнителя"""
         artist_lower = artist.strip().lower()
-        return [track for track in self.tracks if track.artist.lower() == artist_lower]
+        return list(self._by_artist_lc.get(artist_lower, ()))
 
     def get_tracks_by_genre(self, genre: MusicGenre) -> List[Track]:
         """Получить треки указанного жанра"""
-        return [track for track in self.tracks if track.genre == genre]
+        return list(self._by_genre.get(genre, ()))
 
     def get_tracks_by_year(self, year: int) -> List[Track]:
         """Получить треки указанного года"""
-        return [track for track in self.tracks if track.year == year]
+        return list(self._by_year.get(year, ()))
 
     def get_tracks_in_duration_range(self, min_sec: int, max_sec: int) -> List[Track]:
         """Получить треки, длительность которых в указанном диапазоне (в секундах)"""
-        return [
-            track
-            for track in self.tracks
-            if min_sec <= track.duration_seconds <= max_sec
-        ]
+        indices = _duration_range_indices(self._durations_s, min_sec, max_sec)
+        return [self.tracks[i] for i in indices]
 
     def sort_by_duration(self, descending: bool = False) -> None:
         """Отсортировать треки по длительности"""
-        self.tracks.sort(key=lambda t: t.duration_seconds, reverse=descending)
+        self.tracks.sort(key=attrgetter("_duration_seconds"), reverse=descending)
+        self._rebuild_indexes()
 
     def sort_by_title(self, descending: bool = False) -> None:
         """Отсортировать треки по названию"""
-        self.tracks.sort(key=lambda t: t.title.lower(), reverse=descending)
+        self.tracks.sort(key=attrgetter("_title_lc"), reverse=descending)
+        self._rebuild_indexes()
 
     def sort_by_artist(self, descending: bool = False) -> None:
         """Отсортировать треки по исполнителю"""
-        self.tracks.sort(key=lambda t: t.artist.lower(), reverse=descending)
+        self.tracks.sort(key=attrgetter("_artist_lc"), reverse=descending)
+        self._rebuild_indexes()
 
     def get_total_duration(self) -> timedelta:
         """Получить общую длительность плейлиста"""
-        total_seconds = sum(track.duration_seconds for track in self.tracks)
-        return timedelta(seconds=total_seconds)
+        return timedelta(seconds=sum(self._durations_s))
 
     def get_statistics(self) -> dict:
         """Получить статистику по плейлисту"""
         stats = {
             "total_tracks": len(self.tracks),
             "total_duration": str(self.get_total_duration()),
-            "artists": len(set(track.artist.lower() for track in self.tracks)),
+            # Ключи индекса исполнителей - уже уникальные _artist_lc
+            "artists": len(self._by_artist_lc),
             "genres": {},
             "years": {},
         }
 
-        for genre in MusicGenre:
-            count = len(self.get_tracks_by_genre(genre))
-            if count > 0:
-                stats["genres"][genre.value] = count
-
-        for track in self.tracks:
-            if track.year:
-                stats["years"][track.year] = stats["years"].get(track.year, 0) + 1
+        # Распределения по жанрам и годам - это размеры корзин индексов
+        stats["genres"] = {
+            genre.value: len(self._by_genre[genre])
+            for genre in MusicGenre
+            if genre in self._by_genre
+        }
+        stats["years"] = {
+            year: len(tracks) for year, tracks in self._by_year.items() if year
+        }
 
         return stats
 
-    def display_tracks(self, tracks: Optional[List[Track]] = None) -> None:
-        """Вывести список треков"""
+    def display_tracks(
+        self, tracks: Optional[List[Track]] = None, title: Optional[str] = None
+    ) -> None:
+        """Вывести список треков (title заменяет имя плейлиста в заголовке)"""
         if tracks is None:
             tracks = self.tracks
 
@@ -200,11 +301,14 @@ class Playlist:
             click.echo("😔 Нет треков для отображения")
             return
 
-        click.echo(f"\n📋 Плейлист '{self.name}' ({len(tracks)} треков):")
-        click.echo("=" * 80)
-        for i, track in enumerate(tracks, 1):
-            click.echo(f"{i:3}. {track}")
-        click.echo("=" * 80)
+        if title is None:
+            title = self.name
+
+        # Весь блок собирается в одну строку и выводится одной записью
+        lines = [f"\n📋 Плейлист '{title}' ({len(tracks)} треков):", "=" * 80]
+        lines.extend(f"{i:3}. {track}" for i, track in enumerate(tracks, 1))
+        lines.append("=" * 80)
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def save_to_json(self, filename: str) -> bool:
         """Сохранить плейлист в JSON файл"""
@@ -214,8 +318,16 @@ class Playlist:
                 "tracks": [track.to_dict() for track in self.tracks],
             }
 
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # JSON-модули импортируются только при сохранении/загрузке
+            orjson = _import_optional("orjson")
+            if orjson is not None:
+                with open(filename, "wb") as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                import json
+
+                with open(filename, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
 
             click.echo(f"✅ Плейлист сохранен в файл: {filename}")
             return True
@@ -223,21 +335,48 @@ class Playlist:
             click.echo(f"❌ Ошибка при сохранении в файл {filename}: {e}", err=True)
             return False
 
+    @staticmethod
+    def _parse_tracks(tracks_data: Iterable[dict]) -> List[Track]:
+        """Собрать треки из последовательности словарей, пропуская ошибочные"""
+        tracks = []
+        for track_data in tracks_data:
+            try:
+                tracks.append(Track.from_dict(track_data))
+            except Exception as e:
+                click.echo(f"⚠️  Ошибка при загрузке трека: {e}")
+        return tracks
+
     def load_from_json(self, filename: str) -> bool:
         """Загрузить плейлист из JSON файла"""
+        # JSON-модули импортируются только при сохранении/загрузке
+        import json
+
+        orjson = _import_optional("orjson")
+        ijson = _import_optional("ijson")
+        json_errors: tuple = (json.JSONDecodeError,)
+        if ijson is not None:
+            json_errors += (ijson.JSONError,)
+
         try:
-            with open(filename, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            if ijson is not None and os.path.getsize(filename) > _STREAM_LOAD_THRESHOLD:
+                # Большой файл разбирается потоково, трек за треком, без
+                # промежуточного дерева словарей
+                with open(filename, "rb") as f:
+                    name = next(ijson.items(f, "playlist_name"), self.name)
+                    f.seek(0)
+                    tracks = self._parse_tracks(ijson.items(f, "tracks.item"))
+            else:
+                with open(filename, "rb") as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
-            self.name = data.get("playlist_name", self.name)
-            self.tracks.clear()
+                name = data.get("playlist_name", self.name)
+                tracks = self._parse_tracks(data.get("tracks", []))
 
-            for track_data in data.get("tracks", []):
-                try:
-                    track = Track.from_dict(track_data)
-                    self.add_track(track)
-                except Exception as e:
-                    click.echo(f"⚠️  Ошибка при загрузке трека: {e}")
+            # Плейлист меняется только после успешного разбора всего файла
+            self.name = name
+            self.clear()
+            self.add_tracks(*tracks)
 
             click.echo(f"✅ Плейлист загружен из файла: {filename}")
             click.echo(f"   Загружено треков: {len(self.tracks)}")
@@ -245,7 +384,7 @@ class Playlist:
         except FileNotFoundError:
             click.echo(f"❌ Файл не найден: {filename}", err=True)
             return False
-        except json.JSONDecodeError:
+        except json_errors:
             click.echo(f"❌ Ошибка формата JSON в файле: {filename}", err=True)
             return False
         except Exception as e:
@@ -267,17 +406,12 @@ def parse_duration(ctx, param, value):
         return None
 
     try:
-        parts = value.split(":")
-        if len(parts) == 2:
-            minutes, seconds = map(int, parts)
-            return timedelta(minutes=minutes, seconds=seconds)
-        elif len(parts) == 3:
-            hours, minutes, seconds = map(int, parts)
-            return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+        if ":" in value:
+            seconds = _parse_duration_seconds(value)
         else:
             # Попробуем интерпретировать как секунды
             seconds = int(value)
-            return timedelta(seconds=seconds)
+        return timedelta(seconds=seconds)
     except ValueError:
         raise click.BadParameter(
             f"Неверный формат длительности: '{value}'. Используйте MM:SS или HH:MM:SS"
@@ -286,20 +420,19 @@ def parse_duration(ctx, param, value):
 
 def get_genre_by_name(name: str) -> MusicGenre:
     """Получить жанр по имени"""
-    try:
-        return MusicGenre[name.upper()]
-    except KeyError:
-        # Попробуем найти по значению
-        for genre in MusicGenre:
-            if genre.value.lower() == name.lower():
-                return genre
+    # Сначала ищем по имени, затем по значению
+    genre = _GENRE_BY_NAME_UPPER.get(name.upper()) or _GENRE_BY_VALUE_LOWER.get(
+        name.lower()
+    )
+    if genre is None:
         raise click.BadParameter(
             f"Неизвестный жанр: '{name}'. Доступные: {', '.join(g.name for g in MusicGenre)}"
         )
+    return genre
 
 
-def add_demo_tracks():
-    """Добавить демонстрационные треки"""
+def add_demo_tracks(count: Optional[int] = None) -> List[Track]:
+    """Добавить первые count демонстрационных треков (по умолчанию все)"""
     demo_tracks = [
         Track(
             "Bohemian Rhapsody",
@@ -373,6 +506,9 @@ def add_demo_tracks():
         ),
     ]
 
+    if count is not None:
+        demo_tracks = demo_tracks[: max(count, 0)]
+
     playlist.add_tracks(*demo_tracks)
     return demo_tracks
 
@@ -508,16 +644,11 @@ def filter(artist, genre, year, min_duration, max_duration, sort_by, reverse):
 
     # Применяем сортировку если указана
     if sort_by:
-        if sort_by == "duration":
-            filtered_tracks.sort(key=lambda t: t.duration_seconds, reverse=reverse)
-        elif sort_by == "title":
-            filtered_tracks.sort(key=lambda t: t.title.lower(), reverse=reverse)
-        elif sort_by == "artist":
-            filtered_tracks.sort(key=lambda t: t.artist.lower(), reverse=reverse)
+        filtered_tracks = sorted(
+            filtered_tracks, key=attrgetter(_FILTER_SORT_KEYS[sort_by]), reverse=reverse
+        )
 
-    # Создаем временный плейлист для отображения
-    temp_playlist = Playlist("Результаты фильтрации", filtered_tracks)
-    temp_playlist.display_tracks()
+    playlist.display_tracks(filtered_tracks, title="Результаты фильтрации")
 
 
 @cli.command()
@@ -529,23 +660,29 @@ def stats():
 
     stats_data = playlist.get_statistics()
 
-    click.echo(f"\n📊 Статистика плейлиста '{playlist.name}':")
-    click.echo("=" * 50)
-    click.echo(f"Всего треков: {stats_data['total_tracks']}")
-    click.echo(f"Общая длительность: {stats_data['total_duration']}")
-    click.echo(f"Уникальных исполнителей: {stats_data['artists']}")
+    # Весь отчет собирается в одну строку и выводится одной записью
+    lines = [
+        f"\n📊 Статистика плейлиста '{playlist.name}':",
+        "=" * 50,
+        f"Всего треков: {stats_data['total_tracks']}",
+        f"Общая длительность: {stats_data['total_duration']}",
+        f"Уникальных исполнителей: {stats_data['artists']}",
+    ]
 
     if stats_data["genres"]:
-        click.echo("\n📈 Распределение по жанрам:")
-        for genre, count in stats_data["genres"].items():
-            click.echo(f"  {genre}: {count}")
+        lines.append("\n📈 Распределение по жанрам:")
+        lines.extend(
+            f"  {genre}: {count}" for genre, count in stats_data["genres"].items()
+        )
 
     if stats_data["years"]:
-        click.echo("\n📅 Распределение по годам:")
-        for year, count in sorted(stats_data["years"].items()):
-            click.echo(f"  {year}: {count}")
+        lines.append("\n📅 Распределение по годам:")
+        lines.extend(
+            f"  {year}: {count}" for year, count in sorted(stats_data["years"].items())
+        )
 
-    click.echo("=" * 50)
+    lines.append("=" * 50)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 @cli.command()
@@ -578,17 +715,10 @@ def load(file):
 @click.option("--count", "-c", default=10, help="Количество демо-треков для добавления")
 def demo(count):
     """Добавить демонстрационные треки в коллекцию"""
-    all_demo_tracks = add_demo_tracks()
-
-    if count < len(all_demo_tracks):
-        # Ограничиваем количество если указано меньше
-        playlist.tracks = playlist.tracks[: -len(all_demo_tracks)]  # Удаляем все демо
-        for i in range(count):
-            playlist.add_track(all_demo_tracks[i])
+    # Добавляются только нужные треки, без последующего удаления лишних
+    added_tracks = add_demo_tracks(count)
 
-    click.echo(
-        f"✅ Добавлено {min(count, len(all_demo_tracks))} демонстрационных треков"
-    )
+    click.echo(f"✅ Добавлено {len(added_tracks)} демонстрационных треков")
     click.echo(f"📋 Теперь в плейлисте: {len(playlist)} треков")
 
 
@@ -596,7 +726,7 @@ def demo(count):
 @click.confirmation_option(prompt="Вы уверены, что хотите удалить все треки?")
 def clear():
     """Очистить всю коллекцию треков"""
-    playlist.tracks.clear()
+    playlist.clear()
     click.echo("✅ Коллекция треков очищена")
 
 